@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/3.2/ref/settings/
 """
 
 import os
+import sys
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -90,6 +91,14 @@ DATABASES = {
     }
 }
 
+# Run tests against an in-memory SQLite database so queries never touch
+# disk; normal runs keep using PostgreSQL from the environment.
+if 'test' in sys.argv:
+    DATABASES['default'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+    }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
@@ -109,6 +118,11 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Use a fast password hasher in tests so create_user/check_password
+# don't spend time on PBKDF2 rounds.
+if 'test' in sys.argv:
+    PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/3.2/topics/i18n/
@@ -5,28 +5,22 @@ from decimal import Decimal
 
 from unittest.mock import patch
 
-from django.test import TestCase
+from django.test import SimpleTestCase, TestCase
 from django.contrib.auth import get_user_model
 
 from core import models
 
 
+SAMPLE_PRICE = Decimal("5.50")
+
+
 def create_user(email="user@example.com", password="testpass123"):
     """Create and return a new user."""
     return get_user_model().objects.create_user(email=email, password=password)
 
 
-class ModelTests(TestCase):
-    """Test models."""
-
-    def test_create_user_with_email_successful(self):
-        """Test creating a user with email is successful."""
-        email = "test@example.com"
-        password = "testpass123"
-        user = create_user(email=email, password=password)
-
-        self.assertEqual(user.email, email)
-        self.assertTrue(user.check_password(password))
+class ModelLogicTests(SimpleTestCase):
+    """Test model behaviour that never touches the database."""
 
     def test_new_user_email_normalized(self):
         """Test new user email is normalized."""
@@ -37,14 +31,50 @@ class ModelTests(TestCase):
             ["test4@example.COM", "test4@example.com"]
         ]
         for email, expected in sample_emails:
-            user = create_user(email=email, password="sample123")
-            self.assertEqual(user.email, expected)
+            with self.subTest(email=email):
+                user = get_user_model()(
+                    email=get_user_model().objects.normalize_email(email))
+                self.assertEqual(user.email, expected)
 
     def test_new_user_without_email_raises_error(self):
         """Test that creating a user without email raises a ValueError."""
         with self.assertRaises(ValueError):
             create_user("", "sample123")
 
+    def test_recipe_str(self):
+        """Test the recipe string representation."""
+        recipe = models.Recipe(
+            user=get_user_model()(email="test@example.com"),
+            title="sample recipe name",
+            time_minutes=5,
+            price=SAMPLE_PRICE,
+            description="sample recipe description"
+        )
+
+        self.assertEqual(str(recipe), recipe.title)
+
+    @patch("core.models.uuid.uuid4")
+    def test_recipe_file_name_uuid(self, mock_uuid):
+        """Test generating image path."""
+        uuid = "test-uuid"
+        mock_uuid.return_value = uuid
+        file_path = models.recipe_image_file_path(None, "example.jpg")
+
+        self.assertEqual(file_path, f"uploads/recipe/{uuid}.jpg")
+
+
+class ModelTests(TestCase):
+    """Test models that persist to the database."""
+
+    def test_create_user_with_email_successful(self):
+        """Test creating a user with email is successful."""
+        email = "test@example.com"
+        password = "testpass123"
+        user = create_user(email=email, password=password)
+
+        self.assertEqual(user.email, email)
+        self.assertTrue(user.check_password(password))
+
     def test_create_superuser(self):
         """Test creating a superuser"""
         user = get_user_model().objects.create_superuser(
@@ -55,19 +85,6 @@ class ModelTests(TestCase):
         self.assertTrue(user.is_superuser)
         self.assertTrue(user.is_staff)
 
-    def test_create_recipe(self):
-        """Test creating a recipe is successful."""
-        user = create_user("test@example.com", "testpass123")
-        recipe = models.Recipe.objects.create(
-            user=user,
-            title="sample recipe name",
-            time_minutes=5,
-            price=Decimal("5.50"),
-            description="sample recipe description"
-        )
-
-        self.assertEqual(str(recipe), recipe.title)
-
     def test_create_tag(self):
         """Test creating a tag is successful"""
         user = create_user()
@@ -83,12 +100,3 @@ class ModelTests(TestCase):
         )
 
         self.assertEqual(str(ingredient), ingredient.name)
-
-    @patch("core.models.uuid.uuid4")
-    def test_recipe_file_name_uuid(self, mock_uuid):
-        """Test generating image path."""
-        uuid = "test-uuid"
-        mock_uuid.return_value = uuid
-        file_path = models.recipe_image_file_path(None, "example.jpg")
-
-        self.assertEqual(file_path, f"uploads/recipe/{uuid}.jpg")
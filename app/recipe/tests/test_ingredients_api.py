@@ -4,6 +4,7 @@ Tests for the ingredients API.
 from decimal import Decimal
 
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
 from django.urls import reverse
 from django.test import TestCase
 
@@ -25,9 +26,14 @@ def detail_url(ingredient_id):
     return reverse("recipe:ingredient-detail", args=[ingredient_id])
 
 
-def create_user(email="user@example.com", password="testpass123"):
-    """Create and return a user."""
-    return get_user_model().objects.create_user(email=email, password=password)
+# Hashed once at import; these tests never check real credentials.
+HASHED_PASSWORD = make_password("testpass123")
+
+
+def create_user(email="user@example.com"):
+    """Create and return a user with a prehashed password."""
+    return get_user_model().objects.create(
+        email=email, password=HASHED_PASSWORD)
 
 
 class PublicIngredientsApiTests(TestCase):
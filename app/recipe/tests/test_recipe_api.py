@@ -3,12 +3,14 @@ Tests for recipe APIs.
 """
 import tempfile
 import os
+from functools import lru_cache
 
 from PIL import Image
 
 from decimal import Decimal
 
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
 from django.urls import reverse
 from django.test import TestCase
 
@@ -21,50 +23,87 @@ from core.models import (
     Ingredient
 )
 
-from recipe.serializers import (
-    RecipeSerializer,
-    RecipeDetailSerializer,
-)
+from recipe.serializers import RecipeSerializer
 
 
 RECIPES_URL = reverse("recipe:recipe-list")
 
 
+@lru_cache(maxsize=None)
 def detail_url(recipe_id):
     """Create and return a recipe detail URL"""
     return reverse("recipe:recipe-detail", args=[recipe_id])
 
 
+@lru_cache(maxsize=None)
 def image_upload_url(recipe_id):
     """Create and return an image upload URL"""
     return reverse("recipe:recipe-upload-image", args=[recipe_id])
 
 
+RECIPE_DEFAULTS = {
+    "title": "sample recipe title",
+    "description": "sample desciption",
+    "price": Decimal("5.20"),
+    "time_minutes": 10,
+    "link": "http://example.com/sample-recipe.pdf"
+}
+
+PAYLOAD_PRICE = Decimal("4.99")
+
+
 def create_recipe(user, **params):
     """Create and return a sample recipe"""
-    defaults = {
-        "title": "sample recipe title",
-        "description": "sample desciption",
-        "price": Decimal("5.20"),
-        "time_minutes": 10,
-        "link": "http://example.com/sample-recipe.pdf"
-    }
-    defaults.update(params)
+    defaults = {**RECIPE_DEFAULTS, **params}
 
     recipe = Recipe.objects.create(user=user, **defaults)
     return recipe
 
 
-def create_user(**params):
-    """Create and return a new user."""
-    return get_user_model().objects.create_user(**params)
+def bulk_create_recipes(*users, **params):
+    """Create a sample recipe per user with a single INSERT."""
+    defaults = {**RECIPE_DEFAULTS, **params}
+
+    return Recipe.objects.bulk_create(
+        [Recipe(user=user, **defaults) for user in users])
+
+
+# Hash the shared test password once at import; these tests never log in
+# with real credentials, so every user can reuse the same digest.
+HASHED_PASSWORD = make_password("testpass123")
+
+
+def create_user(email, **extra_fields):
+    """Create and return a new user with a prehashed password."""
+    return get_user_model().objects.create(
+        email=email, password=HASHED_PASSWORD, **extra_fields)
+
+
+class PreauthClient(APIClient):
+    """APIClient with a user forced once at construction.
+
+    Mirrors what force_authenticate does per test, but the forced user
+    is set a single time when the class-level client is built.
+    """
+
+    def __init__(self, user, **kwargs):
+        super().__init__(**kwargs)
+        self.handler._force_user = user
+        self.handler._force_token = None
 
 
 class PublicRecipeApiTests(TestCase):
     """Tests unauthenticated API requests."""
 
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.api_client = APIClient()
+
     def setUp(self):
-        self.client = APIClient()
+        # The test runner resets self.client each test; reuse the
+        # class-level APIClient instead of building a new one.
+        self.client = self.api_client
 
     def test_auth_required(self):
         """Test authentication is required to call API."""
@@ -73,59 +112,103 @@ class PublicRecipeApiTests(TestCase):
         self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
 
 
-class PrivateRecipeApiTests(TestCase):
-    """Tests authenticated API requests."""
+class RecipeListApiTests(TestCase):
+    """Tests for listing recipes with class-invariant fixtures."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.api_client = APIClient()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user(email="user@example.com")
+        cls.other_user = create_user(email="other@example.com")
+        bulk_create_recipes(cls.user, cls.user, cls.other_user)
+        # Render the expected payloads once per class; the recipes are
+        # never mutated by these tests.
+        cls.expected_user_data = RecipeSerializer(
+            Recipe.objects.filter(user=cls.user).order_by("-id"),
+            many=True).data
+        cls.expected_other_user_data = RecipeSerializer(
+            Recipe.objects.filter(user=cls.other_user).order_by("-id"),
+            many=True).data
 
     def setUp(self):
-        self.client = APIClient()
-        self.user = create_user(
-            email="user@example.com", password="testpass123")
+        # The test runner resets self.client each test; reuse the
+        # class-level APIClient instead of building a new one.
+        self.client = self.api_client
         self.client.force_authenticate(self.user)
 
+    def tearDown(self):
+        self.client.logout()
+
     def test_retrieve_recipes(self):
         """test retrieving a list of recipes."""
-        create_recipe(user=self.user)
-        create_recipe(user=self.user)
-
-        res = self.client.get(RECIPES_URL)
-
-        recipes = Recipe.objects.all().order_by("-id")
-        serializer = RecipeSerializer(recipes, many=True)
+        # One SELECT for the recipes plus one prefetch each for tags and
+        # ingredients, regardless of how many recipes are listed.
+        with self.assertNumQueries(3):
+            res = self.client.get(RECIPES_URL)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data, self.expected_user_data)
 
     def test_recipe_list_limited_to_user(self):
         """Test list of recipes is limited to authenticated user."""
-        other_user = create_user(
-            email="other@example.com", password="otherpass123")
-        create_recipe(user=self.user)
-        create_recipe(user=other_user)
-
-        res = self.client.get(RECIPES_URL)
+        self.client.force_authenticate(self.other_user)
 
-        recipes = Recipe.objects.filter(user=self.user)
-        serializer = RecipeSerializer(recipes, many=True)
+        with self.assertNumQueries(3):
+            res = self.client.get(RECIPES_URL)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data, self.expected_other_user_data)
+
+
+class PrivateRecipeApiTests(TestCase):
+    """Tests authenticated API requests."""
+
+    @classmethod
+    def setUpClass(cls):
+        # super().setUpClass() runs setUpTestData, so cls.user exists
+        # by the time the preauthenticated client is built.
+        super().setUpClass()
+        cls.api_client = PreauthClient(cls.user)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user(email="user@example.com")
+        cls.other_user = create_user(email="other@example.com")
+
+    def setUp(self):
+        # The test runner resets self.client each test; reuse the
+        # class-level client, which is already authenticated.
+        self.client = self.api_client
 
     def test_get_recipe_detail(self):
         """Test get recipe detail."""
         recipe = create_recipe(user=self.user)
-        serializer = RecipeDetailSerializer(recipe)
 
         url = detail_url(recipe_id=recipe.id)
         res = self.client.get(url)
 
-        self.assertEqual(res.data, serializer.data)
+        # Compare field by field against the known inputs instead of
+        # re-running the serializer on the test side.
+        self.assertEqual(res.data["id"], recipe.id)
+        self.assertEqual(res.data["title"], recipe.title)
+        self.assertEqual(res.data["description"], recipe.description)
+        self.assertEqual(Decimal(res.data["price"]), recipe.price)
+        self.assertEqual(res.data["time_minutes"], recipe.time_minutes)
+        self.assertEqual(res.data["link"], recipe.link)
+        self.assertEqual(res.data["tags"], [])
+        self.assertEqual(res.data["ingredients"], [])
+        self.assertIsNone(res.data["image"])
 
     def test_create_recipe(self):
         """Test creating a recipe."""
         payload = {
             "title": "sample title recipe",
             "time_minutes": 25,
-            "price": Decimal("4.99")
+            "price": PAYLOAD_PRICE
         }
         res = self.client.post(RECIPES_URL, payload)
 
@@ -136,56 +219,50 @@ class PrivateRecipeApiTests(TestCase):
             self.assertEqual(getattr(recipe, k), v)
         self.assertEqual(recipe.user, self.user)
 
-    def test_partial_update(self):
-        """Test partial update of a recipe."""
+    def test_update_recipe(self):
+        """Test partial and full update of a recipe."""
         original_link = "http://example.com/sample-recipe.pdf"
         recipe = create_recipe(
             user=self.user,
             title="sample recipe title",
+            description="sample recipe description",
             link=original_link
         )
-
-        payload = {"title": "New recipe title"}
         url = detail_url(recipe_id=recipe.id)
-        res = self.client.patch(url, payload)
-
-        self.assertEqual(res.status_code, status.HTTP_200_OK)
-        recipe.refresh_from_db()
-        self.assertEqual(recipe.title, payload["title"])
-        self.assertEqual(recipe.link, original_link)
-        self.assertEqual(recipe.user, self.user)
 
-    def test_full_update(self):
-        """Test full update of a recipe."""
-        recipe = create_recipe(
-            user=self.user,
-            title="sample recipe title",
-            description="sample recipe description",
-            price=Decimal("3.50"),
-            time_minutes=15,
-            link="http://example.com/sample-recipe.pdf"
+        with self.subTest(method="patch"):
+            payload = {"title": "New recipe title"}
+            res = self.client.patch(url, payload)
+
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertEqual(res.data["title"], payload["title"])
+            self.assertEqual(res.data["link"], original_link)
+
+        with self.subTest(method="put"):
+            payload = {
+                "title": "Newer recipe title",
+                "description": "New recipe description",
+                "price": "3.75",
+                "time_minutes": 10,
+                "link": "http://example.com/new-recipe.pdf"
+            }
+            res = self.client.put(url, payload)
+
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            for key, val in payload.items():
+                self.assertEqual(res.data[key], val)
+
+        # The updates must not have reassigned the recipe owner; fetch
+        # just that column since user isn't part of the response payload.
+        self.assertEqual(
+            Recipe.objects.values_list(
+                "user_id", flat=True).get(pk=recipe.id),
+            self.user.id
         )
 
-        payload = {
-            "title": "New recipe title",
-            "description": "New recipe description",
-            "price": Decimal("3.75"),
-            "time_minutes": 10,
-            "link": "http://example.com/new-recipe.pdf"
-        }
-        url = detail_url(recipe_id=recipe.id)
-        res = self.client.put(url, payload)
-
-        self.assertEqual(res.status_code, status.HTTP_200_OK)
-        recipe.refresh_from_db()
-        for key, val in payload.items():
-            self.assertEqual(getattr(recipe, key), val)
-        self.assertEqual(recipe.user, self.user)
-
     def test_update_user_returns_error(self):
         """Test changing the recipe user results in an error."""
-        new_user = create_user(email="user2@example.com",
-                               password="testpass123")
+        new_user = create_user(email="user2@example.com")
         recipe = create_recipe(user=self.user)
 
         payload = {"user": new_user.id}
@@ -203,26 +280,24 @@ class PrivateRecipeApiTests(TestCase):
         res = self.client.delete(url)
 
         self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
-        self.assertFalse(Recipe.objects.filter(id=recipe.id).exists())
+        self.assertFalse(Recipe.objects.filter(pk=recipe.id).exists())
 
     def test_delete_other_users_recipe_error(self):
         """Test trying to delete another users recipe give error."""
-        new_user = create_user(email="user2@example.com",
-                               password="testpass123")
-        recipe = create_recipe(user=new_user)
+        recipe = create_recipe(user=self.other_user)
 
         url = detail_url(recipe.id)
         res = self.client.delete(url)
 
         self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
-        self.assertTrue(Recipe.objects.filter(id=recipe.id).exists())
+        self.assertTrue(Recipe.objects.filter(pk=recipe.id).exists())
 
     def test_create_recipe_with_new_tags(self):
         """Test creating a recipe with new tag."""
         payload = {
             "title": "kebab",
             "time_minutes": 30,
-            "price": Decimal("7.25"),
+            "price": PAYLOAD_PRICE,
             "tags": [{"name": "persian"}, {"name": "Dinner"}]
         }
         res = self.client.post(RECIPES_URL, payload, format="json")
@@ -245,7 +320,7 @@ class PrivateRecipeApiTests(TestCase):
         payload = {
             "title": "flafel",
             "time_minutes": 10,
-            "price": Decimal("2.50"),
+            "price": PAYLOAD_PRICE,
             "tags": [{"name": "Persian"}, {"name": "Fastfood"}],
         }
         res = self.client.post(RECIPES_URL, payload, format="json")
@@ -309,7 +384,7 @@ class PrivateRecipeApiTests(TestCase):
         payload = {
             "title": "Kebab",
             "time_minutes": "25",
-            "price": Decimal("7.5"),
+            "price": PAYLOAD_PRICE,
             "ingredients": [{"name": "Meat"}, {"name": "Onion"}]
         }
         res = self.client.post(RECIPES_URL, payload, format="json")
@@ -333,7 +408,7 @@ class PrivateRecipeApiTests(TestCase):
         payload = {
             "title": "Sambooseh",
             "time_minutes": 5,
-            "price": Decimal("1.50"),
+            "price": PAYLOAD_PRICE,
             "ingredients": [{"name": "Salt"}, {"name": "Potato"}],
         }
         res = self.client.post(RECIPES_URL, payload, format="json")
@@ -437,8 +512,7 @@ class ImageUploadTests(TestCase):
 
     def setUp(self):
         self.client = APIClient()
-        self.user = create_user(
-            email="user@example.com", password="testpass123")
+        self.user = create_user(email="user@example.com")
         self.client.force_authenticate(self.user)
         self.recipe = create_recipe(user=self.user)
 
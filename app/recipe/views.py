@@ -69,7 +69,7 @@ class RecipeViewSet(viewsets.ModelViewSet):
 
         return queryset.filter(
             user=self.request.user
-        ).order_by("-id").distinct()
+        ).order_by("-id").distinct().prefetch_related("tags", "ingredients")
 
     def get_serializer_class(self):
         """Return the srializer class for request"""